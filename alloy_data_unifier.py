@@ -1,51 +1,58 @@
 import pandas as pd
 
+from utils import union_keys, is_missing
+
+
+def _parses_as_float(value):
+    """
+    Returns True if float() accepts the value.
+    """
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
 class AlloyDataUnifier:
     """
     Merges alloy data from multiple sources into a single unified dictionary.
     Also identifies missing or invalid data and provides a summary of any issues.
     """
 
-    def __init__(self, text_data, graph_data, config=None):
+    def __init__(self, alloy_data, config=None):
         """
-        Initializes the AlloyDataUnifier with text and graph data dictionaries.
+        Initializes the AlloyDataUnifier with already merged alloy data.
 
         Parameters:
-        - text_data: Dictionary containing text-based alloy data (from OCR).
-        - graph_data: Dictionary containing graph-based alloy data.
+        - alloy_data: Dictionary of text + graph alloy data, as produced by
+                      utils.merge_sources (text data takes precedence in conflicts).
         - config: Optional configuration dictionary (not required for merging,
                   but available if the unifier needs thresholds, etc. later).
         """
-        # Start with a copy of text_data, so we don't mutate the original
-        merged_data = text_data.copy()
-
-        # Merge graph_data into merged_data (text_data takes precedence in conflicts)
-        for alloy_key, graph_values in graph_data.items():
-            if alloy_key in merged_data:
-                merged_data[alloy_key].update(graph_values)
-            else:
-                merged_data[alloy_key] = graph_values
-
-        self.alloy_data = merged_data
+        self.alloy_data = alloy_data
         self.config = config
         self.issues = []
 
     def unify_data(self):
         """
-        Converts self.alloy_data into a DataFrame, fills missing data with 'N/A',
-        and converts it back to a dictionary. Then checks for missing or invalid data.
+        Pads every alloy in self.alloy_data with the full set of traits, filling
+        missing (None or NaN) values with 'N/A'. Then checks for missing or invalid data.
 
         Returns:
         - unified_dict: A dictionary containing the final unified data.
         """
-        # Convert dictionary to DataFrame (keys = alloy names, columns = properties)
-        df = pd.DataFrame.from_dict(self.alloy_data, orient='index')
+        # Union of trait names across all alloys, in first-seen order
+        all_traits = union_keys(self.alloy_data)
 
         # Fill missing values with 'N/A'
-        df.fillna('N/A', inplace=True)
-
-        # Convert back to dictionary
-        unified_dict = df.to_dict(orient='index')
+        unified_dict = {
+            alloy_name: {
+                trait: 'N/A' if is_missing(traits.get(trait)) else traits[trait]
+                for trait in all_traits
+            }
+            for alloy_name, traits in self.alloy_data.items()
+        }
 
         # Check for missing or invalid data
         self._check_for_issues(unified_dict)
@@ -57,28 +64,36 @@ class AlloyDataUnifier:
         Identifies missing or invalid numeric fields in the unified dictionary
         and populates self.issues with descriptive messages.
         """
-        for alloy_name, traits in unified_dict.items():
-            missing_traits = []
-            invalid_traits = []
-
-            for trait, value in traits.items():
-                # If it's 'N/A', record it as missing
-                if value == 'N/A':
-                    missing_traits.append(trait)
-                else:
-                    # Try converting to float to see if it's numeric
-                    try:
-                        float(value)
-                    except ValueError:
-                        invalid_traits.append(trait)
-
-            if missing_traits:
+        if not unified_dict:
+            return
+
+        df = pd.DataFrame.from_dict(unified_dict, orient='index')
+
+        # Coerce every column to numbers at once; anything that fails becomes NaN
+        numeric = df.apply(pd.to_numeric, errors='coerce')
+        missing_mask = df.eq('N/A')
+        invalid_mask = numeric.isna() & ~missing_mask
+
+        # pd.to_numeric rejects some strings float() accepts (e.g. 'nan', '1_000');
+        # re-check only the flagged cells so the result matches a per-value float() test
+        suspects = invalid_mask.stack()
+        for alloy_name, trait in suspects.index[suspects.to_numpy()]:
+            if _parses_as_float(df.at[alloy_name, trait]):
+                invalid_mask.at[alloy_name, trait] = False
+
+        # Only build messages for alloys that actually have a problem
+        flagged = missing_mask.any(axis=1) | invalid_mask.any(axis=1)
+        for alloy_name in df.index[flagged]:
+            missing_traits = df.columns[missing_mask.loc[alloy_name].to_numpy()]
+            invalid_traits = df.columns[invalid_mask.loc[alloy_name].to_numpy()]
+
+            if len(missing_traits):
                 self.issues.append(
-                    f"Alloy '{alloy_name}' is missing traits: {', '.join(missing_traits)}."
+                    f"Alloy '{alloy_name}' is missing traits: {', '.join(map(str, missing_traits))}."
                 )
-            if invalid_traits:
+            if len(invalid_traits):
                 self.issues.append(
-                    f"Alloy '{alloy_name}' has invalid numeric values for traits: {', '.join(invalid_traits)}."
+                    f"Alloy '{alloy_name}' has invalid numeric values for traits: {', '.join(map(str, invalid_traits))}."
                 )
 
     def report_issues(self):
@@ -1,6 +1,8 @@
-import pandas as pd
+import csv
 import logging
 
+from utils import merge_sources, union_keys, is_missing
+
 class DataValidator:
     """
     Validates text, graph, and unified data for consistency, then optionally
@@ -44,34 +46,28 @@ class DataValidator:
         Then updates self.unified_data accordingly.
         Modify or remove if your unifier already handles these tasks.
         """
-        # Example approach:
-        for alloy_name in self.text_data:
-            text_info = self.text_data[alloy_name]
-            graph_info = self.graph_data.get(alloy_name, {})
-
-            cleaned_data = {}
-
-            # Merge text_info, overriding conflicts with text_data
-            for trait, text_val in text_info.items():
-                graph_val = graph_info.get(trait)
-                if graph_val is not None:
-                    if text_val != graph_val:
-                        logging.warning(
-                            f"Conflict in alloy '{alloy_name}' for trait '{trait}'. "
-                            f"Text data = {text_val}, Graph data = {graph_val}. "
-                            "Prioritizing text data."
-                        )
-                    cleaned_data[trait] = text_val
-                else:
-                    cleaned_data[trait] = text_val
-
-            # Add any graph traits not in text
-            for trait, g_val in graph_info.items():
-                if trait not in cleaned_data:
-                    cleaned_data[trait] = g_val
-
-            # Update unified_data with the merged result
-            self.unified_data[alloy_name] = cleaned_data
+        # Report conflicts between the two sources (skipped if warnings are not logged)
+        if logging.getLogger().isEnabledFor(logging.WARNING):
+            for alloy_name, text_info in self.text_data.items():
+                graph_info = self.graph_data.get(alloy_name)
+                if not graph_info:
+                    continue
+                conflicts = [
+                    trait for trait in text_info
+                    if graph_info.get(trait) is not None and text_info[trait] != graph_info[trait]
+                ]
+                if conflicts:
+                    details = "; ".join(
+                        f"'{trait}': Text data = {text_info[trait]}, Graph data = {graph_info[trait]}"
+                        for trait in conflicts
+                    )
+                    logging.warning(
+                        f"Conflict in alloy '{alloy_name}' for {len(conflicts)} trait(s): {details}. "
+                        "Prioritizing text data."
+                    )
+
+        # Update unified_data with the merged result (text data wins conflicts)
+        self.unified_data.update(merge_sources(self.text_data, self.graph_data))
 
         logging.info("Data alignment between text_data and graph_data complete.")
 
@@ -86,14 +82,18 @@ class DataValidator:
         if not self.unified_data:
             raise ValueError("Unified data dictionary is empty. Nothing to export.")
 
-        # Convert the unified_data dictionary to a DataFrame
-        df = pd.DataFrame.from_dict(self.unified_data, orient='index')
-
-        # Fill missing data
-        df.fillna('missing data', inplace=True)
-
-        # Save to CSV
-        df.to_csv(output_path, index_label='Alloy Name')
+        # Column union across all alloys, in first-seen order
+        traits = union_keys(self.unified_data)
+
+        # Stream rows straight to disk; absent or missing (None/NaN) traits become 'missing data'
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.DictWriter(f, fieldnames=['Alloy Name', *traits], restval='missing data')
+            writer.writeheader()
+            writer.writerows(
+                {'Alloy Name': alloy_name,
+                 **{trait: value for trait, value in alloy_traits.items() if not is_missing(value)}}
+                for alloy_name, alloy_traits in self.unified_data.items()
+            )
         logging.info(f"Data exported to CSV at: {output_path}")
         return output_path
 
@@ -8,16 +8,32 @@ organizing the extracted information for further integration.
 """
 
 import os
+import csv
+import functools
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import zip_longest
 import cv2
-import pandas as pd
+import numpy as np
 import pytesseract
 
-# Removed unused imports: re, numpy, matplotlib.pyplot
+# Removed unused imports: re, matplotlib.pyplot
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+# Supported graph image extensions (lowercase, including the dot)
+_IMAGE_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.tif', '.tiff'})
+
+
+@functools.lru_cache(maxsize=1)
+def _tesseract_version():
+    """
+    Queries the Tesseract version once per process (it spawns a subprocess).
+    Failures are not cached, so a later call will try again.
+    """
+    return pytesseract.get_tesseract_version()
+
 
 class GraphReader:
     def __init__(self, config):
@@ -38,8 +54,6 @@ class GraphReader:
 
         os.makedirs(self.output_dir, exist_ok=True)
 
-        os.makedirs(self.output_dir, exist_ok=True)
-
 
     @staticmethod
     def preprocess_image(image_path):
@@ -53,11 +67,11 @@ class GraphReader:
         - Preprocessed image (numpy array) or None if processing fails.
         """
         try:
-            image = cv2.imread(image_path)
-            if image is None:
+            # Decode straight to grayscale; no separate BGR->gray pass needed
+            gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+            if gray is None:
                 logging.warning(f"Unable to read graph image: {image_path}")
                 return None
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
             blur = cv2.medianBlur(gray, 5)
             thresh = cv2.adaptiveThreshold(blur, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
                                            cv2.THRESH_BINARY, 11, 2)
@@ -73,7 +87,7 @@ class GraphReader:
         Checks if Tesseract OCR is installed.
         """
         try:
-            pytesseract.get_tesseract_version()
+            _tesseract_version()
             logging.info("Tesseract OCR is installed.")
         except Exception as e:
             logging.error("Tesseract OCR is not installed or not configured properly.")
@@ -102,14 +116,14 @@ class GraphReader:
         Maps pixel coordinates to actual data values based on axis properties.
 
         Parameters:
-        - pixels: List of pixel coordinates.
+        - pixels: Array (or list) of pixel coordinates.
         - axis_properties: Dictionary with axis scaling information.
 
         Returns:
-        - List of data points.
+        - NumPy array of data points.
         """
         # Dummy mapping; replace with actual conversion logic
-        data_points = [p * axis_properties.get("x_scale", 1) for p in pixels]
+        data_points = np.asarray(pixels) * axis_properties.get("x_scale", 1)
         return data_points
 
 
@@ -135,7 +149,7 @@ class GraphReader:
         - image_path: File path of the graph image.
 
         Returns:
-        - List of data points or None if extraction fails.
+        - NumPy array of data points or None if extraction fails.
         """
         preprocessed = self.preprocess_image(image_path)
         if preprocessed is None:
@@ -153,7 +167,8 @@ class GraphReader:
         if hasattr(largest_contour, 'get'):
             largest_contour = largest_contour.get()
 
-        pixels = [pt[0][0] for pt in largest_contour]
+        # Contours are (N, 1, 2) arrays of (x, y); keep the x coordinates
+        pixels = largest_contour.reshape(-1, 2)[:, 0]
         axis_props = self.identify_axis_properties(preprocessed)
         data_points = self.map_pixels_to_data(pixels, axis_props)
         return data_points
@@ -170,12 +185,18 @@ class GraphReader:
             logging.error("Graph input directory not found.")
             return all_data
 
-        for file in os.listdir(self.input_dir):
-            if file.lower().endswith(('.png', '.jpg', '.jpeg', '.tif', '.tiff')):
-                image_path = os.path.join(self.input_dir, file)
-                logging.info(f"Processing graph image: {image_path}")
-                data_points = self.extract_data_points(image_path)
-                if data_points:
+        with os.scandir(self.input_dir) as entries:
+            images = {entry.name: entry.path for entry in entries
+                      if entry.is_file() and os.path.splitext(entry.name)[1].lower() in _IMAGE_EXTS}
+        if not images:
+            return all_data
+        logging.info(f"Processing {len(images)} graph image(s) from {self.input_dir}")
+
+        # Images are independent, so extract them in parallel worker processes
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(self.extract_data_points, images.values(), chunksize=4)
+            for file, data_points in zip(images, results):
+                if data_points is not None and len(data_points):
                     all_data[file] = data_points
         return all_data
 
@@ -189,8 +210,11 @@ class GraphReader:
         """
         try:
             output_file = os.path.join(self.output_dir, "graph_data.csv")
-            df = pd.DataFrame(dict([(k, pd.Series(v)) for k, v in data.items()]))
-            df.to_csv(output_file, index=False)
+            # One column per image; shorter columns are padded with empty cells
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(data.keys())
+                writer.writerows(zip_longest(*data.values(), fillvalue=''))
             logging.info(f"Graph data saved to {output_file}")
         except Exception as e:
             logging.error(f"Error saving graph data: {e}")
@@ -10,16 +10,13 @@ If any critical error occurs, the program stops execution for debugging.
 
 import os
 import logging
-import pandas as pd  # for final material selection steps, if needed
 
-from utils import load_config
+from utils import load_config, merge_sources
 from structural_components import StructuralComponents
 from structural_data_importer import StructuralDataImporter
-from text_extractor import TextExtractor
-from graph_reader import GraphReader
-from alloy_data_unifier import AlloyDataUnifier
-from data_validator import DataValidator
-from material_selector import MaterialSelector
+
+# The extraction pipeline (OpenCV, Tesseract, pandas) is imported lazily in
+# Main.run, so options 1 and 2 start without loading it.
 
 
 class Main:
@@ -42,6 +39,10 @@ class Main:
           6. (Optional) Convert unified data to a DataFrame for material selection.
           7. (Optional) Secondary checks on the selected materials.
         """
+        config = self.config
+        paths = config.get("paths", {})
+        application = config.get("application", "pontoons")
+
         user_input = input("Enter 1 for SolidWorks, 2 for Python data importer, 3 for YAML configuration: ").strip()
 
         # --------------------------------------------------------------------
@@ -49,48 +50,52 @@ class Main:
         # --------------------------------------------------------------------
         if user_input == '1':
             # Use StructuralComponents if a SolidWorks file is provided
-            solidworks_file = self.config.get("solidworks_file", None)
+            solidworks_file = config.get("solidworks_file", None)
             if not solidworks_file:
                 raise RuntimeError("SolidWorks file not specified in configuration.")
-            structural_data = StructuralComponents(solidworks_file, self.config).extract_component_data()
+            structural_data = StructuralComponents(solidworks_file, config).extract_component_data()
 
         elif user_input == '2':
             # Use StructuralDataImporter if a tailored Python file is provided
-            data_file = self.config.get("data_file", None)
+            data_file = config.get("data_file", None)
             if not data_file:
                 raise RuntimeError("Data file for structural import not specified in configuration.")
-            structural_data = StructuralDataImporter(data_file, self.config).import_structural_data()
+            structural_data = StructuralDataImporter(data_file, config).import_structural_data()
 
         else:
             # Otherwise, use basic data from configuration
-            structural_data = self.config.get("basic_data", {})
+            structural_data = config.get("basic_data", {})
+
+            from text_extractor import TextExtractor
+            from graph_reader import GraphReader
+            from alloy_data_unifier import AlloyDataUnifier
+            from data_validator import DataValidator
 
             # ----------------------------------------------------------------
             # Step 2: Text Extraction from DjVu (using djvu_path from config)
             # ----------------------------------------------------------------
-            djvu_path = self.config["paths"].get("djvu_path", "")
+            djvu_path = paths.get("djvu_path", "")
             if not djvu_path or not os.path.isfile(djvu_path):
                 raise RuntimeError(f"No valid DjVu file found at {djvu_path}")
 
             # Provide the single djvu_path as the input to TextExtractor
             input_files = [djvu_path]
-            text_extractor = TextExtractor(input_files, self.config)
+            text_extractor = TextExtractor(input_files, config)
             text_data = text_extractor.process_files()
 
             # ----------------------------------------------------------------
             # Step 3: Graph Extraction
             # (Assumes you have images in config["graph_input_dir"] or similar)
             # ----------------------------------------------------------------
-            graph_reader = GraphReader(self.config)
+            graph_reader = GraphReader(config)
             graph_data = graph_reader.process_files()
 
             # ----------------------------------------------------------------
             # Step 4: Unify Text + Graph Data
             # ----------------------------------------------------------------
-            # The new AlloyDataUnifier might require text_data, graph_data, and config
-            # or it might just take text_data, graph_data in the constructor.
-            # Adjust as per your updated code signature.
-            alloy_data_unifier = AlloyDataUnifier(text_data, graph_data, self.config)
+            # Merge once here; the unifier only pads and checks the merged data.
+            merged_data = merge_sources(text_data, graph_data)
+            alloy_data_unifier = AlloyDataUnifier(merged_data, config)
             unified_data = alloy_data_unifier.unify_data()
 
             # ----------------------------------------------------------------
@@ -102,7 +107,7 @@ class Main:
                 text_data=text_data,
                 graph_data=graph_data,
                 unified_data=unified_data,
-                config=self.config
+                config=config
             )
             try:
                 data_validator.validate_data()
@@ -121,6 +126,9 @@ class Main:
             if not unified_data:
                 logging.warning("No unified data found. Skipping material selection.")
             else:
+                import pandas as pd
+                from material_selector import MaterialSelector
+
                 # Example: Convert dict -> DataFrame
                 materials_df = pd.DataFrame.from_dict(unified_data, orient='index')
                 # For ranking, we typically need numeric columns. Convert if needed:
@@ -128,7 +136,6 @@ class Main:
 
                 # The new MaterialSelector might just take materials_df
                 # or it might require (materials_df, config, application, weights).
-                application = self.config.get("application", "pontoons")
                 weights = {
                     "strength": 0.3,
                     "density": -0.2,  # negative if lower density is better
@@ -1,5 +1,39 @@
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+
+def _weighted_scores(values, weights):
+    """
+    Computes the weighted score of every material (row) in a float64 matrix.
+
+    :param values: 2-D C-contiguous array (materials x criteria).
+    :param weights: 1-D array with one weight per criterion column.
+    :return: 1-D array of weighted scores.
+    """
+    # A single matrix-vector product (one BLAS call, no per-criterion temporaries)
+    return values @ weights
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _weighted_scores(values, weights):
+        scores = np.zeros(values.shape[0])
+        for i in range(values.shape[0]):
+            total = 0.0
+            for j in range(weights.shape[0]):
+                total += values[i, j] * weights[j]
+            scores[i] = total
+        return scores
+
+
+# Number of distinct weight sets whose scores are memoized per selector
+_SCORE_CACHE_SIZE = 128
+
 
 class MaterialSelector:
     """
@@ -19,8 +53,62 @@ class MaterialSelector:
                                  ...
         """
         self.materials_df = materials_df.copy()  # Keep an internal copy to avoid modifying the original
+        self._score_cache = {}  # {frozenset(weights.items()): scores}
+
+        # Coerce every property column to float64 once; missing/non-numeric values become 0
+        self._numeric_matrix = {
+            column: pd.to_numeric(self.materials_df[column], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+            for column in self.materials_df.columns
+            if column != 'Material'
+        }
+        # Material names in row order (fall back to the index when there is no 'Material' column)
+        if 'Material' in self.materials_df.columns:
+            self._materials = self.materials_df['Material'].to_numpy()
+        else:
+            self._materials = self.materials_df.index.to_numpy()
+
+    def _criteria(self, weights):
+        """
+        Returns the weighted criteria that exist as columns, warning about the rest.
+        """
+        criteria = []
+        for criterion in weights:
+            if criterion in self._numeric_matrix:
+                criteria.append(criterion)
+            else:
+                print(f"Warning: Criterion '{criterion}' is missing from the DataFrame. Skipping...")
+        return criteria
+
+    def _compute_scores(self, weights):
+        """
+        Computes the weighted score of every material, in materials_df row order.
+        Results are memoized on the weights, so repeated calls are O(1).
 
-    def rank_materials(self, application, weights):
+        :param weights: A dictionary mapping property -> weight (float).
+        :return: A 1-D float64 array of weighted scores.
+        """
+        key = frozenset(weights.items())
+        scores = self._score_cache.get(key)
+        if scores is not None:
+            return scores
+
+        criteria = self._criteria(weights)
+
+        # Calculate weighted scores in one compiled pass over a contiguous matrix
+        if criteria:
+            values = np.column_stack([self._numeric_matrix[c] for c in criteria])
+        else:
+            values = np.zeros((len(self._materials), 0))
+        weight_vector = np.fromiter((weights[c] for c in criteria), dtype=np.float64, count=len(criteria))
+        scores = _weighted_scores(values, weight_vector)
+        scores.flags.writeable = False  # shared through the cache
+
+        if len(self._score_cache) >= _SCORE_CACHE_SIZE:
+            self._score_cache.pop(next(iter(self._score_cache)))
+        self._score_cache[key] = scores
+        return scores
+
+    def rank_materials(self, application, weights, top_k=None):
         """
         Ranks the materials based on the provided weights for the specified application.
 
@@ -29,22 +117,23 @@ class MaterialSelector:
         :param weights: A dictionary mapping property -> weight (float).
                         Example: {'Buoyancy': 0.4, 'Strength': 0.3, 'Cost': -0.2, 'Corrosion Resistance': 0.2}
                         Positive weight means "higher is better", negative weight means "lower is better".
+        :param top_k: Optional number of top materials to return. When set, only a partial
+                      selection (nlargest) is done instead of sorting every material.
         :return: A DataFrame of materials ranked by 'Weighted Score' (descending).
         """
         # Create a copy so we don't overwrite self.materials_df
         ranked_df = self.materials_df.copy()
 
-        # Initialize the Weighted Score column
-        ranked_df['Weighted Score'] = 0.0
+        scores = self._compute_scores(weights)
 
-        # Calculate weighted scores
-        for criterion, weight in weights.items():
-            if criterion in ranked_df.columns:
-                # Fill missing values with 0 or a default if needed
-                ranked_df[criterion] = pd.to_numeric(ranked_df[criterion], errors='coerce').fillna(0)
-                ranked_df['Weighted Score'] += ranked_df[criterion] * weight
-            else:
-                print(f"Warning: Criterion '{criterion}' is missing from the DataFrame. Skipping...")
+        # Show the criteria as the numbers that were actually scored
+        for criterion in weights:
+            if criterion in self._numeric_matrix:
+                ranked_df[criterion] = self._numeric_matrix[criterion]
+        ranked_df['Weighted Score'] = scores
+
+        if top_k is not None:
+            return ranked_df.nlargest(top_k, 'Weighted Score')
 
         # Sort by Weighted Score (descending)
         ranked_df.sort_values(by='Weighted Score', ascending=False, inplace=True)
@@ -59,9 +148,9 @@ class MaterialSelector:
         :param weights: Dictionary mapping property -> weight.
         :return: The name (string) of the top-ranked material.
         """
-        ranked_materials = self.rank_materials(application, weights)
-        # Return the 'Material' value of the first row
-        return ranked_materials.iloc[0]['Material']
+        scores = self._compute_scores(weights)
+        # Return the 'Material' value of the highest-scoring row (no full ranking needed)
+        return self._materials[int(scores.argmax())]
 
 
 # Example usage (test/demo)
@@ -10,21 +10,80 @@ import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
 from scipy.special import erf
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+# Rows parsed per chunk when streaming the CSV
+CHUNK_SIZE = 2_000_000
+
+
+def _read_chunks(full_path):
+    """
+    Yields the 'Distance' and 'hours' columns of the CSV as DataFrames.
+
+    Uses pandas' multi-threaded pyarrow engine when pyarrow is installed (the whole
+    file in one frame, the engine does not support chunksize), otherwise streams the
+    file through the default C engine in CHUNK_SIZE row chunks.
+
+    Parameters:
+    - full_path: Path to the CSV file.
+
+    Returns:
+    - Iterator of DataFrames with float32 'Distance' and 'hours' columns.
+    """
+    usecols = ['Distance', 'hours']
+    dtype = {'Distance': 'float32', 'hours': 'float32'}
+    try:
+        yield pd.read_csv(full_path, engine='pyarrow', usecols=usecols, dtype=dtype)
+    except ImportError:  # pyarrow is optional
+        yield from pd.read_csv(full_path, usecols=usecols, dtype=dtype, chunksize=CHUNK_SIZE)
+
+
 def load_csv_file():
     """
-    Loads data from a predefined CSV file.
+    Reads the 'Distance' and 'hours' columns from a predefined CSV file
+    and computes the Distance statistics for each distinct hours value.
 
     Returns:
-    - DataFrame with the loaded data.
+    - unique_hours: Sorted array of distinct hours (float64).
+    - avg_distance: Mean Distance [µm] per hour.
+    - std_distance: Sample standard deviation of Distance [µm] per hour (NaN for a single reading).
     """
     full_path = r"C:\Users\ramaa\Documents\frogsthriver\metal_data1.csv"
     if os.path.exists(full_path):
         print(f"File found: {full_path}")
-        data_df = pd.read_csv(full_path)
-        return data_df
+        # Per-frame partial counts, sums and sums of squares, bucketed by hours
+        keys, counts, sums, sq_sums = [], [], [], []
+        for chunk in _read_chunks(full_path):
+            distance = chunk['Distance'].to_numpy(dtype=np.float64)
+            hours = chunk['hours'].to_numpy()
+            # Skip blank readings, as groupby(...).mean()/.std() did
+            keep = ~(np.isnan(hours) | np.isnan(distance))
+            distance = distance[keep]
+            uniq, inv = np.unique(hours[keep], return_inverse=True)
+            keys.append(uniq)
+            counts.append(np.bincount(inv))
+            sums.append(np.bincount(inv, weights=distance))
+            sq_sums.append(np.bincount(inv, weights=distance * distance))
+        if not keys:
+            empty = np.empty(0)
+            return empty, empty, empty
+
+        # Combine the partial sums of all frames
+        uniq, inv = np.unique(np.concatenate(keys), return_inverse=True)
+        count = np.bincount(inv, weights=np.concatenate(counts))
+        total = np.bincount(inv, weights=np.concatenate(sums))
+        sq_total = np.bincount(inv, weights=np.concatenate(sq_sums))
+
+        avg_distance = total / count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (sq_total - count * avg_distance * avg_distance) / (count - 1)
+        std_distance = np.sqrt(np.maximum(variance, 0))
+        return uniq.astype(np.float64), avg_distance, std_distance
     else:
         raise FileNotFoundError(f"File not found at: {full_path}")
 
@@ -59,45 +118,80 @@ def linear_func(x, m, b):
     return m * x + b
 
 
-# ===== FIRST GRAPH (Full Dataset) =====
+def fit_stats(x, y, m, b):
+    """
+    Computes the sums of squares needed for R² of a linear fit.
+
+    Parameters:
+    - x: Independent variable.
+    - y: Observed values.
+    - m: Slope.
+    - b: Intercept.
+
+    Returns:
+    - (ss_res, ss_tot): Residual and total sums of squares.
+    """
+    ss_res = np.sum((y - linear_func(x, m, b)) ** 2)
+    ss_tot = np.sum((y - np.mean(y)) ** 2)
+    return ss_res, ss_tot
+
+
+if njit is not None:
+    @njit(cache=True)
+    def fit_stats(x, y, m, b):
+        # Fused version: no intermediate residual arrays
+        n = x.size
+        y_mean = 0.0
+        for i in range(n):
+            y_mean += y[i]
+        y_mean /= n
+        ss_res = 0.0
+        ss_tot = 0.0
+        for i in range(n):
+            r = y[i] - (m * x[i] + b)
+            ss_res += r * r
+            d = y[i] - y_mean
+            ss_tot += d * d
+        return ss_res, ss_tot
 
-data_df = load_csv_file()
-print("Columns in the loaded CSV:", data_df.columns.tolist())
 
-# Convert units:
-# Convert Distance from µm to m (assumes column name is 'Distance'; corrected from 'Distence')
-data_df['Distance_m'] = data_df['Distance'] * 1e-6
-# Convert time from hours to seconds
-data_df['time_s'] = data_df['hours'] * 3600
+# ===== FIRST GRAPH (Full Dataset) =====
 
-# Group data by hours to compute average and standard deviation
-grouped = data_df.groupby('hours')
-avg_distance_m = grouped['Distance_m'].mean()
-std_distance_m = grouped['Distance_m'].std()
+unique_hours, avg_distance_um, std_distance_um = load_csv_file()
 
-unique_hours = avg_distance_m.index.values
-avg_distance_m_vals = avg_distance_m.values
+# Convert the per-hour average and standard deviation of Distance from µm to m
+# (assumes column name is 'Distance'; corrected from 'Distence')
+avg_distance_m_vals = avg_distance_um * 1e-6
+std_distance_m_vals = std_distance_um * 1e-6
 
 # Convert hours to seconds and compute square root of time
 time_seconds = unique_hours * 3600
 sqrt_time_seconds = np.sqrt(time_seconds)
 
-# Fit the linear function to the averaged data
-popt, pcov = curve_fit(linear_func, sqrt_time_seconds, avg_distance_m_vals)
+# Fit the linear function to the averaged data (closed-form least squares)
+A = np.vstack([sqrt_time_seconds, np.ones_like(sqrt_time_seconds)]).T
+popt, _, _, _ = np.linalg.lstsq(A, avg_distance_m_vals, rcond=None)
 m, b = popt
+
+# Residual and total sums of squares in one pass (shared by the errors and R²)
+ss_res, ss_tot = fit_stats(sqrt_time_seconds, avg_distance_m_vals, m, b)
+
+# Parameter covariance, scaled by the residual variance (same as curve_fit's default)
+sigma2 = ss_res / (len(avg_distance_m_vals) - 2)
+pcov = sigma2 * np.linalg.inv(A.T @ A)
 perr = np.sqrt(np.diag(pcov))
 m_err, b_err = perr
 
-# Compute residuals and R² value
-residuals = avg_distance_m_vals - linear_func(sqrt_time_seconds, m, b)
-ss_res = np.sum(residuals ** 2)
-ss_tot = np.sum((avg_distance_m_vals - np.mean(avg_distance_m_vals)) ** 2)
+# Compute R² value
 r_squared = 1 - (ss_res / ss_tot)
 
 # Plot the first graph (full dataset)
 plt.figure(figsize=(10, 6))
 plt.plot(sqrt_time_seconds, avg_distance_m_vals, 'o', label='Averaged Data', linestyle='none')
-x_line = np.linspace(min(sqrt_time_seconds), max(sqrt_time_seconds), 100)
+# The fit is a straight line, so its two endpoints are enough to draw it
+xmin = sqrt_time_seconds.min()
+xmax = sqrt_time_seconds.max()
+x_line = np.array([xmin, xmax])
 y_line = linear_func(x_line, m, b)
 plt.plot(x_line, y_line, 'r-', label='Linear fit')
 plt.title('Diffusion distance as a function of sqrt(Time) (Full Data)')
@@ -1,5 +1,55 @@
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional
+    njit = None
+
+# Reason codes returned by _eval_thresholds (0 = pass)
+_BUOYANCY_LOW, _STRENGTH_LOW, _COST_HIGH = 1, 2, 3
+_BUOYANCY_NOT_NUMERIC, _STRENGTH_NOT_NUMERIC, _COST_NOT_NUMERIC = 4, 5, 6
+
+
+def _eval_thresholds(buoyancy, strength, cost, not_numeric, bmin, smin, cmax):
+    """
+    Assigns a reason code to every alloy, checking Buoyancy, then Strength, then Cost.
+
+    :param buoyancy, strength, cost: float64 arrays (NaN where the value is missing).
+    :param not_numeric: (n, 3) bool array flagging non-numeric Buoyancy/Strength/Cost values.
+    :param bmin, smin, cmax: Thresholds; -inf/-inf/+inf when not configured.
+    :return: int8 array of reason codes.
+    """
+    return np.select(
+        [not_numeric[:, 0], buoyancy < bmin,
+         not_numeric[:, 1], strength < smin,
+         not_numeric[:, 2], cost > cmax],
+        [_BUOYANCY_NOT_NUMERIC, _BUOYANCY_LOW,
+         _STRENGTH_NOT_NUMERIC, _STRENGTH_LOW,
+         _COST_NOT_NUMERIC, _COST_HIGH],
+        default=0,
+    ).astype(np.int8)
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _eval_thresholds(buoyancy, strength, cost, not_numeric, bmin, smin, cmax):
+        codes = np.zeros(buoyancy.shape[0], dtype=np.int8)
+        for i in prange(buoyancy.shape[0]):
+            if not_numeric[i, 0]:
+                codes[i] = _BUOYANCY_NOT_NUMERIC
+            elif buoyancy[i] < bmin:
+                codes[i] = _BUOYANCY_LOW
+            elif not_numeric[i, 1]:
+                codes[i] = _STRENGTH_NOT_NUMERIC
+            elif strength[i] < smin:
+                codes[i] = _STRENGTH_LOW
+            elif not_numeric[i, 2]:
+                codes[i] = _COST_NOT_NUMERIC
+            elif cost[i] > cmax:
+                codes[i] = _COST_HIGH
+        return codes
+
 
 class SecondaryChecker:
     """
@@ -24,9 +74,14 @@ class SecondaryChecker:
                            },
                            ...
                        }
+
+        The checker only reads alloy_df and does not take ownership of it: it keeps a reference,
+        so the caller must not mutate the frame while the checker is in use. Set
+        config["defensive_copy"] to hold a shallow copy (shared data blocks) instead.
         """
-        self.alloy_df = alloy_df.copy()  # Keep a copy of the DataFrame
         self.config = config  # Configuration with thresholds, etc.
+        # Shares the caller's DataFrame unless a defensive (shallow) copy is requested
+        self.alloy_df = alloy_df if not self.config.get("defensive_copy") else alloy_df.copy(deep=False)
 
     def check_materials(self, component):
         """
@@ -44,46 +99,59 @@ class SecondaryChecker:
         # If not found, fallback to an empty dict
         component_thresholds = self.config.get("default_thresholds", {}).get(component, {})
 
-        validation_report = []
-
-        for _, row in self.alloy_df.iterrows():
-            material_name = row.get("Material", "Unknown")
-            entry = {"Material": material_name, "Status": "Pass"}
-
-            # Example property checks:
-            # Buoyancy check
-            if "buoyancy_min" in component_thresholds and "Buoyancy" in row:
-                try:
-                    if float(row["Buoyancy"]) < component_thresholds["buoyancy_min"]:
-                        entry["Status"] = "Fail"
-                        entry["Reason"] = f"Buoyancy below {component_thresholds['buoyancy_min']}"
-                except ValueError:
-                    entry["Status"] = "Fail"
-                    entry["Reason"] = "Buoyancy not numeric"
-
-            # Strength check
-            if entry["Status"] == "Pass" and "strength_min" in component_thresholds and "Strength" in row:
-                try:
-                    if float(row["Strength"]) < component_thresholds["strength_min"]:
-                        entry["Status"] = "Fail"
-                        entry["Reason"] = f"Strength below {component_thresholds['strength_min']}"
-                except ValueError:
-                    entry["Status"] = "Fail"
-                    entry["Reason"] = "Strength not numeric"
-
-            # Cost check
-            if entry["Status"] == "Pass" and "cost_max" in component_thresholds and "Cost" in row:
+        df = self.alloy_df
+        material_names = df["Material"].tolist() if "Material" in df.columns else ["Unknown"] * len(df)
+
+        n = len(df)
+        not_numeric = np.zeros((n, 3), dtype=np.bool_)
+
+        def column_values(index, column, key):
+            # NaN everywhere (never fails) unless the threshold and the column both exist
+            if key not in component_thresholds or column not in df.columns:
+                return np.full(n, np.nan)
+            raw = df[column]
+            values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=np.float64, copy=True)
+            failed = np.isnan(values) & raw.notna().to_numpy()
+            # pd.to_numeric rejects some strings float() accepts (e.g. 'nan', '1_000'); retry just those
+            for i in np.flatnonzero(failed):
                 try:
-                    if float(row["Cost"]) > component_thresholds["cost_max"]:
-                        entry["Status"] = "Fail"
-                        entry["Reason"] = f"Cost above {component_thresholds['cost_max']}"
-                except ValueError:
-                    entry["Status"] = "Fail"
-                    entry["Reason"] = "Cost not numeric"
-
-            # Add more checks if needed (e.g., corrosion_resistance_min, etc.)
+                    value = float(raw.iat[i])
+                except (TypeError, ValueError):
+                    continue
+                values[i] = value
+                failed[i] = False
+            not_numeric[:, index] = failed
+            return values
+
+        buoyancy = column_values(0, "Buoyancy", "buoyancy_min")
+        strength = column_values(1, "Strength", "strength_min")
+        cost = column_values(2, "Cost", "cost_max")
+        # Add more checks if needed (e.g., corrosion_resistance_min, etc.)
+
+        codes = _eval_thresholds(
+            buoyancy, strength, cost, not_numeric,
+            float(component_thresholds.get("buoyancy_min", -np.inf)),
+            float(component_thresholds.get("strength_min", -np.inf)),
+            float(component_thresholds.get("cost_max", np.inf)),
+        )
+
+        reasons = {
+            _BUOYANCY_LOW: f"Buoyancy below {component_thresholds.get('buoyancy_min')}",
+            _STRENGTH_LOW: f"Strength below {component_thresholds.get('strength_min')}",
+            _COST_HIGH: f"Cost above {component_thresholds.get('cost_max')}",
+            _BUOYANCY_NOT_NUMERIC: "Buoyancy not numeric",
+            _STRENGTH_NOT_NUMERIC: "Strength not numeric",
+            _COST_NOT_NUMERIC: "Cost not numeric",
+        }
 
-            validation_report.append(entry)
+        validation_report = []
+        for material_name, code in zip(material_names, codes.tolist()):
+            if code:
+                validation_report.append(
+                    {"Material": material_name, "Status": "Fail", "Reason": reasons[code]}
+                )
+            else:
+                validation_report.append({"Material": material_name, "Status": "Pass"})
 
         return validation_report
 
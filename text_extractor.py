@@ -10,17 +10,45 @@ structured format for further analysis.
 
 """ write for each function what it does and what it returns """
 import os
+import functools
 import logging
 import re
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import pytesseract
 from PIL import Image
 import cv2
 import numpy as np
-import json
+from utils import dump_json
+
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+except ImportError:  # tesserocr is optional; pytesseract is used instead
+    PyTessBaseAPI = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+# Structuring element for the morphological opening in preprocess_image
+_MORPH_KERNEL = np.ones((3, 3), np.uint8)
+
+# Threads decoding and preprocessing pages ahead of OCR; OCR itself gets the CPU cores
+_DECODE_THREADS = 2
+
+
+@functools.lru_cache(maxsize=1)
+def _tess_api():
+    """
+    Returns an in-process Tesseract API shared by every page OCR'd in this process,
+    so the language model is loaded once instead of spawning tesseract per page.
+    The API is never closed explicitly: it lives as long as the (worker) process and
+    is released by the OS when the process exits. Returns None when tesserocr is not installed.
+    """
+    if PyTessBaseAPI is None:
+        return None
+    return PyTessBaseAPI(psm=PSM.AUTO)
+
 
 # In text_extractor.py
 
@@ -70,6 +98,18 @@ class TextExtractor:
             logging.error("Critical configuration settings are missing: properties or alloy patterns.")
             raise RuntimeError("Critical configuration settings are missing.")
 
+        # Precompile regex patterns once. Alloy patterns stay separate regexes: each is
+        # scanned on its own, so overlapping matches and per-pattern groups/flags behave as in re.findall.
+        try:
+            self._alloy_res = [re.compile(pattern, re.IGNORECASE) for pattern in self.alloy_patterns]
+            self._prop_res = {
+                prop_name: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+                for prop_name, patterns in self.properties_to_extract.items()
+            }
+        except re.error as e:
+            logging.error(f"Invalid regex pattern in configuration: {e}")
+            raise RuntimeError("Invalid regex pattern in configuration.")
+
         os.makedirs(self.output_dir, exist_ok=True)
 
         # Define supported image extensions
@@ -80,27 +120,29 @@ class TextExtractor:
         self.alloy_data = {}       # {alloy_name: {property: value}}
 
     @staticmethod
-    def preprocess_image(image_path):
+    def preprocess_image(image):
         """
         Applies advanced image preprocessing to enhance OCR accuracy.
 
         Parameters:
-        - image_path: Path to the image.
+        - image: Path to the image, or an already decoded BGR image (numpy array).
 
         Returns:
         - Preprocessed image (numpy array) or None if processing fails.
         """
         try:
-            image = cv2.imread(image_path)
-            if image is None:
-                logging.warning(f"Unable to read image: {image_path}")
-                return None
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            if isinstance(image, str):
+                image_path = image
+                image = cv2.imread(image_path)
+                if image is None:
+                    logging.warning(f"Unable to read image: {image_path}")
+                    return None
+            # UMat runs the chain through OpenCV's T-API (OpenCL when available, CPU otherwise)
+            gray = cv2.cvtColor(cv2.UMat(image), cv2.COLOR_BGR2GRAY)
             blur = cv2.GaussianBlur(gray, (5, 5), 0)
             _, thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            kernel = np.ones((3, 3), np.uint8)
-            opening = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
-            return opening
+            opening = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, _MORPH_KERNEL)
+            return opening.get()
         except Exception as e:
             logging.error(f"Error during image preprocessing: {e}")
             return None
@@ -119,7 +161,12 @@ class TextExtractor:
         """
         try:
             pil_image = Image.fromarray(image)
-            extracted_text = pytesseract.image_to_string(pil_image)
+            api = _tess_api()
+            if api is not None:
+                api.SetImage(pil_image)
+                extracted_text = api.GetUTF8Text()
+            else:
+                extracted_text = pytesseract.image_to_string(pil_image)
             if not extracted_text.strip():
                 logging.warning("No text extracted from the image.")
             return extracted_text
@@ -139,9 +186,8 @@ class TextExtractor:
         """
         try:
             alloys = []
-            for pattern in self.alloy_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                alloys.extend(matches)
+            for regex in self._alloy_res:
+                alloys.extend(regex.findall(text))
             if not alloys:
                 logging.warning("No alloys identified in the text.")
             else:
@@ -164,9 +210,9 @@ class TextExtractor:
         """
         try:
             properties = {}
-            for prop_name, patterns in self.properties_to_extract.items():
-                for pattern in patterns:
-                    match = re.search(pattern, text, re.IGNORECASE)
+            for prop_name, regexes in self._prop_res.items():
+                for regex in regexes:
+                    match = regex.search(text)
                     if match:
                         value = match.group(1)
                         properties[prop_name] = value
@@ -194,8 +240,7 @@ class TextExtractor:
                 with open(text_file_path, 'w', encoding='utf-8') as f:
                     f.write(text)
             data_file_path = os.path.join(self.output_dir, 'alloy_data.json')
-            with open(data_file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.alloy_data, f, indent=4)
+            dump_json(self.alloy_data, data_file_path)
             logging.info(f"Data saved successfully in {self.output_dir}")
         except Exception as e:
             logging.error(f"Error during data saving: {e}")
@@ -209,59 +254,133 @@ class TextExtractor:
         Returns:
         - The unified alloy data.
         """
+        # Pages are rendered lazily and OCR'd in parallel; alloy identification and
+        # aggregation stay in this process, in the original page order
+        for name, text in self._ocr_pages(self._iter_pages()):
+            if not text:
+                continue
+            self.extracted_texts[name] = text
+            alloys = self.identify_alloys(text)
+            if alloys:
+                # Properties depend only on the page text, so extract them once per page
+                properties = self.extract_properties(text)
+                for alloy in alloys:
+                    self.alloy_data.setdefault(alloy, {}).update(properties)
+        self.save_data()
+        return self.alloy_data
+
+    def _iter_pages(self):
+        """
+        Yields every page of the valid files, one at a time, so only the pages
+        currently being processed are held in memory.
+
+        Returns:
+        - Iterator of (name, image) tuples, where image is a file path or a BGR numpy array.
+        """
         for file in self.valid_files:
             logging.info(f"Processing file: {file}")
             ext = os.path.splitext(file)[1].lower()
             if ext == '.djvu':
-                images = self.convert_djvu_to_images(file)
-                if not images:
-                    continue
+                yield from self.convert_djvu_to_images(file)
             elif ext in self.image_extensions:
-                images = [file]
+                yield file, file
             else:
                 logging.warning(f"Unsupported file type: {file}")
-                continue
 
-            for image in images:
-                preprocessed = self.preprocess_image(image)
-                if preprocessed is None:
+    @staticmethod
+    def _ocr_pages(pages):
+        """
+        Runs preprocessing and OCR as a two-stage pipeline: a few threads pull pages from the
+        (lazy) source, read and preprocess them (mostly I/O and OpenCV, which releases the GIL)
+        and feed a bounded queue, while a process pool runs OCR on the preprocessed pages
+        as they arrive.
+
+        Parameters:
+        - pages: Iterator of (name, image) tuples, where image is a file path or a BGR numpy array.
+
+        Returns:
+        - List of (name, extracted text) tuples in source order; the text is empty where
+          preprocessing or OCR failed.
+        """
+        workers = os.cpu_count() or 1
+        depth = 2 * workers  # Preprocessed pages buffered ahead of OCR
+        ready = queue.Queue(maxsize=depth)
+        done = object()
+        names = []  # Page names in source order; the pages themselves are not kept
+        source_lock = threading.Lock()
+
+        def produce():
+            try:
+                while True:
+                    with source_lock:
+                        page = next(pages, None)
+                        if page is None:
+                            return
+                        index = len(names)
+                        names.append(page[0])
+                    preprocessed = TextExtractor.preprocess_image(page[1])
+                    del page  # Release the raw page before possibly blocking on the queue
+                    ready.put((index, preprocessed))
+            finally:
+                ready.put(done)
+
+        decoders = min(_DECODE_THREADS, workers)
+        producers = [threading.Thread(target=produce, daemon=True) for _ in range(decoders)]
+        for producer in producers:
+            producer.start()
+
+        texts = {}
+        pending = {}
+
+        def collect(futures):
+            for future in futures:
+                texts[pending.pop(future)] = future.result()
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            running = decoders
+            while running:
+                entry = ready.get()
+                if entry is done:
+                    running -= 1
                     continue
-                text = self.extract_text(preprocessed)
-                if not text:
+                index, preprocessed = entry
+                if preprocessed is None:
                     continue
-                self.extracted_texts[image] = text
-                alloys = self.identify_alloys(text)
-                for alloy in alloys:
-                    properties = self.extract_properties(text)
-                    if alloy not in self.alloy_data:
-                        self.alloy_data[alloy] = properties
-                    else:
-                        self.alloy_data[alloy].update(properties)
-        self.save_data()
-        return self.alloy_data
+                # Cap pages in flight so the pool's backlog cannot outgrow the queue
+                if len(pending) >= depth:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                pending[executor.submit(TextExtractor.extract_text, preprocessed)] = index
+            collect(list(pending))
+
+        for producer in producers:
+            producer.join()
+        return [(name, texts.get(index, "")) for index, name in enumerate(names)]
 
     def convert_djvu_to_images(self, djvu_file):
         """
-        Converts a DjVu file to a list of image file paths using djvu.decode.
+        Renders the pages of a DjVu file one by one to in-memory BGR images using djvu.decode.
+        Pages are only written to disk as PNG when config['debug_dump_pages'] is set.
 
         Parameters:
         - djvu_file: File path of the DjVu document.
 
         Returns:
-        - List of image file paths.
+        - Iterator of (page_name, image) tuples, one page at a time, where page_name is the
+          page's PNG file path and image is a BGR numpy array.
         """
         try:
             import djvu.decode
         except ImportError:
             logging.error("The 'djvu.decode' module is not installed. Please install it to process DjVu files.")
-            return []
+            return
 
         try:
             # פותחים את קובץ ה־DjVu עם הספרייה
             doc = djvu.decode.open(djvu_file)
             logging.info(f"Opened DjVu file using djvu.decode: {djvu_file}")
 
-            images = []
+            page_count = 0
             for page_index, page in enumerate(doc.pages):
                 # ננסה לייצר תמונת PIL מכל עמוד
                 # page.render() מחזיר אובייקט RenderedPage, שממנו אפשר להפיק תמונת PIL
@@ -273,14 +392,14 @@ class TextExtractor:
                     f"{os.path.splitext(os.path.basename(djvu_file))[0]}_page{page_index + 1}.png"
                 )
 
-                pil_image.save(image_path, format="PNG")
-                images.append(image_path)
+                if self.config.get("debug_dump_pages"):
+                    pil_image.save(image_path, format="PNG")
+                # RGB -> BGR, the channel order OpenCV expects
+                image = np.asarray(pil_image.convert("RGB"))[:, :, ::-1].copy()
+                page_count += 1
+                yield image_path, image
 
-            logging.info(f"Converted {djvu_file} to {len(images)} image(s) using djvu.decode.")
-            return images
+            logging.info(f"Converted {djvu_file} to {page_count} image(s) using djvu.decode.")
 
         except Exception:
             logging.exception("Error converting DjVu to images with djvu.decode:")
-            return []
-
-
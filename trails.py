@@ -1,25 +1,51 @@
+import functools
 import requests
+from requests.adapters import HTTPAdapter
 
-# Define the search query
-search_query = "djvulibre-3.5.27+4.10.5_win32.zip"
+# Seconds to wait on each search request
+REQUEST_TIMEOUT = 5
 
-# Perform a search on GitHub and SourceForge for possible sources
-github_url = f"https://api.github.com/search/repositories?q={search_query}"
-sourceforge_url = f"https://sourceforge.net/directory/?q={search_query}"
 
-# Try searching GitHub
-github_response = requests.get(github_url)
-if github_response.status_code == 200:
-    github_results = github_response.json()
-    github_links = [repo["html_url"] for repo in github_results.get("items", [])]
-else:
-    github_links = []
+@functools.lru_cache(maxsize=1)
+def _session():
+    """
+    Returns a shared HTTP session, created on first use, so repeated searches reuse connections.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2)
+    session.mount("https://", adapter)
+    return session
 
-# Provide the SourceForge search link
-sourceforge_links = [sourceforge_url]
 
-# Combine the results
-download_links = github_links + sourceforge_links
+def search_djvu_sources(query):
+    """
+    Searches GitHub and SourceForge for possible download sources of a file.
 
-# Display results
-download_links
+    Parameters:
+    - query: File name or search terms (e.g., 'djvulibre-3.5.27+4.10.5_win32.zip').
+
+    Returns:
+    - list: GitHub repository links followed by the SourceForge search link.
+    """
+    # Perform a search on GitHub and SourceForge for possible sources
+    github_url = f"https://api.github.com/search/repositories?q={query}"
+    sourceforge_url = f"https://sourceforge.net/directory/?q={query}"
+
+    # Try searching GitHub
+    github_response = _session().get(github_url, timeout=REQUEST_TIMEOUT)
+    if github_response.status_code == 200:
+        github_results = github_response.json()
+        github_links = [repo["html_url"] for repo in github_results.get("items", [])]
+    else:
+        github_links = []
+
+    # Provide the SourceForge search link
+    sourceforge_links = [sourceforge_url]
+
+    # Combine the results
+    return github_links + sourceforge_links
+
+
+if __name__ == "__main__":
+    # Display results
+    print(search_djvu_sources("djvulibre-3.5.27+4.10.5_win32.zip"))
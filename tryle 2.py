@@ -11,19 +11,73 @@ import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
+
+# Rows parsed per chunk when streaming the CSV
+CHUNK_SIZE = 2_000_000
+
+
+def _read_chunks(full_path):
+    """
+    Yields the 'Distance' and 'hours' columns of the CSV as DataFrames.
+
+    Uses pandas' multi-threaded pyarrow engine when pyarrow is installed (the whole
+    file in one frame, the engine does not support chunksize), otherwise streams the
+    file through the default C engine in CHUNK_SIZE row chunks.
+
+    Parameters:
+    - full_path: Path to the CSV file.
+
+    Returns:
+    - Iterator of DataFrames with float32 'Distance' and 'hours' columns.
+    """
+    usecols = ['Distance', 'hours']
+    dtype = {'Distance': 'float32', 'hours': 'float32'}
+    try:
+        yield pd.read_csv(full_path, engine='pyarrow', usecols=usecols, dtype=dtype)
+    except ImportError:  # pyarrow is optional
+        yield from pd.read_csv(full_path, usecols=usecols, dtype=dtype, chunksize=CHUNK_SIZE)
+
 
 def load_csv_file():
     """
-    Loads metal data from a CSV file.
+    Reads the 'Distance' and 'hours' columns of the metal data CSV
+    and computes the Distance statistics for each distinct hours value.
 
     Returns:
-    - DataFrame with metal data.
+    - unique_hours: Sorted array of distinct hours (float64).
+    - avg_distance: Mean Distance [µm] per hour.
+    - std_distance: Sample standard deviation of Distance [µm] per hour (NaN for a single reading).
     """
     full_path = r"C:\Users\ramaa\Documents\frogsthriver\metal_data1.csv"
     if os.path.exists(full_path):
-        data_df = pd.read_csv(full_path)
-        return data_df
+        # Per-frame partial counts, sums and sums of squares, bucketed by hours
+        keys, counts, sums, sq_sums = [], [], [], []
+        for chunk in _read_chunks(full_path):
+            distance = chunk['Distance'].to_numpy(dtype=np.float64)
+            hours = chunk['hours'].to_numpy()
+            # Skip blank readings, as groupby(...).mean()/.std() did
+            keep = ~(np.isnan(hours) | np.isnan(distance))
+            distance = distance[keep]
+            uniq, inv = np.unique(hours[keep], return_inverse=True)
+            keys.append(uniq)
+            counts.append(np.bincount(inv))
+            sums.append(np.bincount(inv, weights=distance))
+            sq_sums.append(np.bincount(inv, weights=distance * distance))
+        if not keys:
+            empty = np.empty(0)
+            return empty, empty, empty
+
+        # Combine the partial sums of all frames
+        uniq, inv = np.unique(np.concatenate(keys), return_inverse=True)
+        count = np.bincount(inv, weights=np.concatenate(counts))
+        total = np.bincount(inv, weights=np.concatenate(sums))
+        sq_total = np.bincount(inv, weights=np.concatenate(sq_sums))
+
+        avg_distance = total / count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (sq_total - count * avg_distance * avg_distance) / (count - 1)
+        std_distance = np.sqrt(np.maximum(variance, 0))
+        return uniq.astype(np.float64), avg_distance, std_distance
     else:
         raise FileNotFoundError(f"File not found at: {full_path}")
 
@@ -45,25 +99,19 @@ def linear_func(x, m, b):
 
 # ===== Process Data (Filtered Version) =====
 
-data_df = load_csv_file()
-
-# Convert time from hours to seconds
-data_df['time_s'] = data_df['hours'] * 3600
-
-# Group data by hours and compute average distance (µm)
-grouped = data_df.groupby('hours')
-avg_distance_um = grouped['Distance'].mean()  # Corrected from 'Distence'
-std_distance_um = grouped['Distance'].std()
-
-unique_hours = avg_distance_um.index.values
-avg_distance_vals = avg_distance_um.values
+# Average distance (µm) and standard deviation per hour ('Distance', corrected from 'Distence')
+unique_hours, avg_distance_vals, std_distance_vals = load_csv_file()
 
 time_seconds = unique_hours * 3600
 sqrt_time_seconds = np.sqrt(time_seconds)
 
-# Fit the linear model to the averaged data
-popt, pcov = curve_fit(linear_func, sqrt_time_seconds, avg_distance_vals)
+# Fit the linear model to the averaged data (closed-form least squares)
+A = np.vstack([sqrt_time_seconds, np.ones_like(sqrt_time_seconds)]).T
+popt, _, _, _ = np.linalg.lstsq(A, avg_distance_vals, rcond=None)
 m, b = popt
+# Parameter covariance, scaled by the residual variance (same as curve_fit's default)
+sigma2 = np.sum((avg_distance_vals - A @ popt) ** 2) / (len(avg_distance_vals) - 2)
+pcov = sigma2 * np.linalg.inv(A.T @ A)
 perr = np.sqrt(np.diag(pcov))
 m_err, b_err = perr
 
@@ -76,7 +124,10 @@ r_squared = 1 - (ss_res / ss_tot)
 # Plot the filtered data graph
 plt.figure(figsize=(10, 6))
 plt.plot(sqrt_time_seconds, avg_distance_vals, 'o', label='Averaged Data (Filtered)', linestyle='none')
-x_line = np.linspace(min(sqrt_time_seconds), max(sqrt_time_seconds), 100)
+# The fit is a straight line, so its two endpoints are enough to draw it
+xmin = sqrt_time_seconds.min()
+xmax = sqrt_time_seconds.max()
+x_line = np.array([xmin, xmax])
 y_line = linear_func(x_line, m, b)
 plt.plot(x_line, y_line, 'r-', label='Linear fit')
 plt.title('Diffusion distance as a function of sqrt(Time) (Filtered Data)')
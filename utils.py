@@ -3,15 +3,23 @@ Utility Functions Module
 
 Description:
 Provides supporting functions for logging errors and warnings,
-ensuring necessary directories exist, saving files, and loading configuration.
+ensuring necessary directories exist, saving files, loading configuration,
+and merging alloy data from multiple sources.
 """
 
 import os
+import copy
 import logging
 import yaml
 import re
 import json
 import csv
+from itertools import chain
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard json module is used instead
+    orjson = None
 
 # Removed unused import 'sys'
 
@@ -53,6 +61,23 @@ def create_directory_if_missing(path):
         logging.info(f"Directory already exists: {path}")
 
 
+def dump_json(data, path):
+    """
+    Writes data to a JSON file, using orjson when it is installed.
+
+    Parameters:
+    - data: JSON-serializable data (NumPy arrays are accepted with orjson).
+    - path (str): File path.
+    """
+    if orjson is not None:
+        with open(path, 'wb') as file:
+            file.write(orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=4)
+
+
 def save_file(data, path, file_format='json'):
     """
     Saves data to a file in the specified format.
@@ -65,8 +90,7 @@ def save_file(data, path, file_format='json'):
     try:
         os.makedirs(os.path.dirname(path), exist_ok=True)
         if file_format.lower() == 'json':
-            with open(path, 'w', encoding='utf-8') as file:
-                json.dump(data, file, indent=4)
+            dump_json(data, path)
         elif file_format.lower() == 'csv':
             with open(path, 'w', newline='', encoding='utf-8') as file:
                 writer = csv.writer(file)
@@ -77,27 +101,94 @@ def save_file(data, path, file_format='json'):
                     writer.writerows(data)
         else:
             log_warning("Unsupported file format. Saving as JSON by default.")
-            with open(path, 'w', encoding='utf-8') as file:
-                json.dump(data, file, indent=4)
+            dump_json(data, path)
     except Exception as e:
         log_error(f"Failed to save data to file: {e}")
 
 
+# Parsed configuration files, keyed by path; only successful loads are stored
+_config_cache = {}
+
+
 def load_config(config_file="config.yaml"):
     """
     Loads configuration settings from a YAML file.
+    The parsed result is cached, so repeated loads of the same file skip the YAML parse;
+    each call returns its own copy, which callers are free to modify.
 
     Parameters:
     - config_file (str): Path to the YAML configuration file.
 
     Returns:
-    - dict: Configuration dictionary.
+    - dict: Configuration dictionary (None for an empty file, which is not cached).
+    """
+    if config_file not in _config_cache:
+        try:
+            with open(config_file, 'r', encoding='utf-8') as file:
+                config = yaml.safe_load(file)
+        except Exception as e:
+            log_error(f"Failed to load configuration file: {e}")
+        if config is None:
+            return None
+        _config_cache[config_file] = config
+    return copy.deepcopy(_config_cache[config_file])
+
+
+def merge_sources(text_data, graph_data):
+    """
+    Merges text-based and graph-based alloy data into a new dictionary.
+    Text data takes precedence when both sources define the same trait.
+    Neither input (nor its inner dictionaries) is modified.
+
+    Parameters:
+    - text_data (dict): {alloy_name: {trait: value}} from OCR.
+    - graph_data (dict): {alloy_name: {trait: value}} from graph extraction.
+
+    Returns:
+    - dict: Merged {alloy_name: {trait: value}} for every alloy in either source.
     """
+    return {
+        alloy: {**graph_data.get(alloy, {}), **text_data.get(alloy, {})}
+        for alloy in {**text_data, **graph_data}
+    }
+
+
+def union_keys(nested):
+    """
+    Collects the union of inner-dictionary keys (e.g., every trait across all alloys).
+
+    Parameters:
+    - nested (dict): {outer_key: {inner_key: value}}.
+
+    Returns:
+    - list: Unique inner keys in first-seen order.
+    """
+    return list(dict.fromkeys(chain.from_iterable(nested.values())))
+
+
+def is_missing(value):
+    """
+    Checks whether a single trait value is missing, the way pandas' isna/fillna see it.
+
+    Parameters:
+    - value: A scalar trait value.
+
+    Returns:
+    - bool: True for None, NaN, NaT and pd.NA; False otherwise.
+    """
+    if value is None:
+        return True
     try:
-        with open(config_file, 'r', encoding='utf-8') as file:
-            return yaml.safe_load(file)
-    except Exception as e:
-        log_error(f"Failed to load configuration file: {e}")
+        # NaN and NaT are the only values that differ from themselves
+        return bool(value != value)
+    except TypeError:  # pd.NA refuses truth testing
+        return True
+    except ValueError:  # Array-like values are not scalars
+        return False
+
+
+# A 'start-end' page range entry, matched a whole line at a time
+_PAGE_RANGE_RE = re.compile(r'^[ \t]*(\d+)[ \t]*-[ \t]*(\d+)[ \t]*$', re.MULTILINE)
 
 
 def parse_page_ranges(page_ranges):
@@ -111,6 +202,14 @@ def parse_page_ranges(page_ranges):
     - list: List of individual page numbers.
     """
     pages = []
+    # One sweep over all entries, one entry per line
+    pairs = _PAGE_RANGE_RE.findall('\n'.join(page_ranges))
+    if len(pairs) == len(page_ranges):
+        for start, end in pairs:
+            pages.extend(range(int(start), int(end) + 1))
+        return pages
+
+    # Some entry is not plain 'start-end'; parse each one as int() allows and warn on the rest
     for page_range in page_ranges:
         try:
             start, end = map(int, page_range.split('-'))